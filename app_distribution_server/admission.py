@@ -0,0 +1,168 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app_distribution_server.config import (
+    ADMISSION_MEMORY_BUDGET_BYTES,
+    ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    MAX_CONCURRENT_DOWNLOADS,
+    MAX_CONCURRENT_UPLOADS,
+)
+from app_distribution_server.errors import ServiceUnavailableError
+from app_distribution_server.logger import logger
+
+# Shared by every limiter, as they all draw from the same memory budget.
+_condition = asyncio.Condition()
+_memory_in_use = 0
+
+
+class Admission:
+    def __init__(self, limiter: "AdmissionLimiter", declared_size: int, slots: int | None):
+        self.limiter = limiter
+        self.declared_size = declared_size
+        # Number of concurrent operations allowed, None when unlimited
+        self.slots = slots
+        self.released = False
+
+    async def release(self):
+        if self.released:
+            return
+
+        self.released = True
+        await self.limiter.release(self.declared_size, self.slots or 1)
+
+    async def shrink(self, slots: int):
+        """
+        Gives back the slots over `slots`, once fewer are needed than were taken.
+        """
+
+        if self.released or self.slots is None or slots >= self.slots:
+            return
+
+        extra_slots = self.slots - slots
+        self.slots = slots
+        await self.limiter.release(0, extra_slots)
+
+
+class AdmissionLimiter:
+    """
+    Bounds the number of concurrent operations of a kind, and the memory they hold
+    (based on their declared sizes) when `use_memory_budget` is set. A limit of 0 disables it.
+    Requests over the limits wait up to `queue_timeout` seconds before being rejected.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        use_memory_budget: bool = True,
+        memory_budget: int = ADMISSION_MEMORY_BUDGET_BYTES,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    ):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.memory_budget = memory_budget if use_memory_budget else 0
+        self.queue_timeout = queue_timeout
+        self.active = 0
+
+    def _get_charged_size(self, declared_size: int) -> int:
+        return declared_size if self.memory_budget else 0
+
+    def _can_admit(self, declared_size: int) -> bool:
+        if self.max_concurrent and self.active >= self.max_concurrent:
+            return False
+
+        # A single request bigger than the whole budget is still admitted when nothing else runs
+        if self.memory_budget and _memory_in_use > 0:
+            return _memory_in_use + declared_size <= self.memory_budget
+
+        return True
+
+    def _get_slots(self, max_slots: int | None) -> int | None:
+        limits = [max_slots]
+        if self.max_concurrent:
+            limits.append(self.max_concurrent - self.active)
+
+        bounded_limits = [limit for limit in limits if limit is not None]
+        return min(bounded_limits) if bounded_limits else None
+
+    async def acquire(self, declared_size: int, max_slots: int | None = 1) -> Admission:
+        """
+        Waits for at least one free slot, then takes up to `max_slots` of them
+        (all the free ones when None).
+        """
+
+        global _memory_in_use  # noqa: PLW0603
+
+        async with _condition:
+            if not self._can_admit(declared_size):
+                if self.queue_timeout <= 0:
+                    self._reject(declared_size)
+
+                try:
+                    await asyncio.wait_for(
+                        _condition.wait_for(lambda: self._can_admit(declared_size)),
+                        timeout=self.queue_timeout,
+                    )
+                except TimeoutError:
+                    self._reject(declared_size)
+
+            slots = self._get_slots(max_slots)
+            self.active += slots or 1
+            _memory_in_use += self._get_charged_size(declared_size)
+
+        return Admission(self, declared_size, slots)
+
+    async def release(self, declared_size: int, slots: int = 1):
+        global _memory_in_use  # noqa: PLW0603
+
+        async with _condition:
+            self.active -= slots
+            _memory_in_use -= self._get_charged_size(declared_size)
+            _condition.notify_all()
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        declared_size: int,
+        max_slots: int | None = 1,
+    ) -> AsyncIterator[Admission]:
+        admission = await self.acquire(declared_size, max_slots)
+        try:
+            yield admission
+        finally:
+            await admission.release()
+
+    def _reject(self, declared_size: int):
+        logger.warning(
+            f"Rejecting {self.name} of {declared_size} bytes:"
+            f" {self.active} active, {_memory_in_use} bytes in use",
+        )
+        raise ServiceUnavailableError()
+
+
+class AdmittedResponse(StreamingResponse):
+    """
+    Streaming response that releases its admission once it has been sent,
+    or once sending it failed (ex: client disconnected).
+    """
+
+    def __init__(self, *args: Any, admission: Admission, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.admission = admission
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.admission.release()
+
+
+upload_limiter = AdmissionLimiter("upload", MAX_CONCURRENT_UPLOADS)
+# Downloads are streamed in small chunks, so they are only bounded by their number.
+# This way, big uploads never prevent installs.
+download_limiter = AdmissionLimiter("download", MAX_CONCURRENT_DOWNLOADS, use_memory_budget=False)
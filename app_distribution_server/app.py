@@ -1,3 +1,5 @@
+from collections.abc import Awaitable, Callable
+
 from fastapi import FastAPI, Response
 from fastapi.requests import Request
 from fastapi.responses import PlainTextResponse
@@ -7,6 +9,7 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 from app_distribution_server.config import (
     APP_TITLE,
     APP_VERSION,
+    REQUEST_TRACING_ENABLED,
 )
 from app_distribution_server.errors import (
     InternalServerError,
@@ -15,6 +18,7 @@ from app_distribution_server.errors import (
 )
 from app_distribution_server.logger import logger
 from app_distribution_server.routers import api_router, app_files_router, health_router, html_router
+from app_distribution_server.tracing import log_request_trace, start_request_trace
 
 app = FastAPI(
     title=APP_TITLE,
@@ -32,13 +36,38 @@ app.include_router(app_files_router.router)
 app.include_router(health_router.router)
 
 
+if REQUEST_TRACING_ENABLED:
+
+    @app.middleware("http")
+    async def request_tracing_middleware(
+        request: Request,
+        call_next: Callable[[Request], Awaitable[Response]],
+    ) -> Response:
+        with start_request_trace() as request_trace:
+            response = await call_next(request)
+
+        response.headers["Server-Timing"] = request_trace.get_server_timing_header()
+        log_request_trace(
+            request.method,
+            request.url.path,
+            response.status_code,
+            request_trace,
+        )
+
+        return response
+
+
 @app.exception_handler(UserError)
 async def exception_handler(
     request: Request,
     exception: UserError,
 ) -> Response:
     if request.url.path.startswith("/api/"):
-        return PlainTextResponse(content=exception.ERROR_MESSAGE)
+        return PlainTextResponse(
+            content=exception.ERROR_MESSAGE,
+            status_code=exception.STATUS_CODE,
+            headers=exception.headers,
+        )
 
     return await html_router.render_error_page(request, exception)
 
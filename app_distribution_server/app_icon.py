@@ -0,0 +1,171 @@
+import io
+import posixpath
+import struct
+import zipfile
+import zlib
+from typing import Any
+
+from androguard.core.apk import APK
+from PIL import Image
+
+from app_distribution_server.logger import logger
+from app_distribution_server.tracing import traced
+
+ICON_THUMBNAIL_SIZES = (64, 128, 192)
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Highest density of regular launcher icons, skipping the adaptive (XML) icons of `anydpi`
+ANDROID_XXXHDPI = 640
+
+
+def _read_png_chunks(png: bytes) -> list[tuple[bytes, bytes]]:
+    chunks = []
+    position = len(PNG_SIGNATURE)
+
+    while position < len(png):
+        (length,) = struct.unpack(">I", png[position : position + 4])
+        chunk_type = png[position + 4 : position + 8]
+        chunks.append((chunk_type, png[position + 8 : position + 8 + length]))
+        position += length + 12
+
+    return chunks
+
+
+def _build_png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    crc = zlib.crc32(chunk_type + data)
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", crc)
+
+
+def normalize_apple_png(png: bytes) -> bytes:
+    """
+    Xcode stores iOS app icons as "CgBI" PNGs: raw deflate streams and BGRA pixels,
+    which regular image libraries can't read. Convert them back to standard PNGs.
+    Alpha premultiplication is kept as is, which is not noticeable on (opaque) app icons.
+    """
+
+    if not png.startswith(PNG_SIGNATURE):
+        return png
+
+    chunks = _read_png_chunks(png)
+    if not chunks or chunks[0][0] != b"CgBI":
+        return png
+
+    header = next(data for chunk_type, data in chunks if chunk_type == b"IHDR")
+    width, height, bit_depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", header)
+
+    if bit_depth != 8 or color_type != 6 or interlace != 0:  # noqa: PLR2004
+        raise ValueError("Unsupported CgBI PNG format")
+
+    compressed_pixels = b"".join(data for chunk_type, data in chunks if chunk_type == b"IDAT")
+    pixels = bytearray(zlib.decompress(compressed_pixels, -zlib.MAX_WBITS))
+
+    # PNG filters work on each channel independently,
+    # so channels can be swapped without un-filtering the rows.
+    row_length = width * 4 + 1
+    for row_start in range(0, height * row_length, row_length):
+        row = pixels[row_start + 1 : row_start + row_length]
+        row[0::4], row[2::4] = row[2::4], row[0::4]
+        pixels[row_start + 1 : row_start + row_length] = row
+
+    return b"".join(
+        [
+            PNG_SIGNATURE,
+            _build_png_chunk(b"IHDR", header),
+            _build_png_chunk(b"IDAT", zlib.compress(pixels)),
+            _build_png_chunk(b"IEND", b""),
+        ]
+    )
+
+
+def _find_ipa_icon_file(
+    ipa: zipfile.ZipFile,
+    app_directory: str,
+    info: dict[str, Any],
+) -> zipfile.ZipInfo | None:
+    # Plist values are not validated, any of them can have an unexpected type
+    icon_files_lists = [info.get("CFBundleIconFiles")]
+
+    for icons_key in ["CFBundleIcons", "CFBundleIcons~ipad"]:
+        icons = info.get(icons_key)
+        primary_icon = icons.get("CFBundlePrimaryIcon") if isinstance(icons, dict) else None
+        if isinstance(primary_icon, dict):
+            icon_files_lists.append(primary_icon.get("CFBundleIconFiles"))
+
+    icon_names = [
+        icon_name
+        for icon_files in icon_files_lists
+        if isinstance(icon_files, list)
+        for icon_name in icon_files
+        if isinstance(icon_name, str) and icon_name
+    ]
+
+    if not icon_names:
+        logger.info("No icon declared in plist file")
+        return None
+
+    candidates = [
+        file_info
+        for file_info in ipa.infolist()
+        if posixpath.dirname(file_info.filename) == app_directory.rstrip("/")
+        and file_info.filename.endswith(".png")
+        and posixpath.basename(file_info.filename).startswith(tuple(icon_names))
+    ]
+
+    if not candidates:
+        logger.info("Could not find the icon files declared in plist file")
+        return None
+
+    # The biggest file has the highest resolution
+    return max(candidates, key=lambda file_info: file_info.file_size)
+
+
+def get_ipa_icon(
+    ipa: zipfile.ZipFile,
+    app_directory: str,
+    info: dict[str, Any],
+) -> bytes | None:
+    try:
+        icon_file_info = _find_ipa_icon_file(ipa, app_directory, info)
+        if icon_file_info is None:
+            return None
+
+        return normalize_apple_png(ipa.read(icon_file_info))
+    except Exception:
+        logger.exception("Failed to read app icon")
+        return None
+
+
+def get_apk_icon(apk: APK) -> bytes | None:
+    try:
+        icon_path = apk.get_app_icon(max_dpi=ANDROID_XXXHDPI)
+        if icon_path is None or not icon_path.endswith((".png", ".webp")):
+            logger.info(f"No bitmap launcher icon found (got {icon_path!r})")
+            return None
+
+        return apk.get_file(icon_path)
+    except Exception:
+        logger.exception("Failed to read launcher icon")
+        return None
+
+
+@traced("app_icon")
+def get_icon_thumbnails(icon: bytes) -> dict[int, bytes]:
+    try:
+        with Image.open(io.BytesIO(icon)) as icon_image:
+            image = icon_image.convert("RGBA")
+    except Exception:
+        logger.exception("Failed to decode app icon")
+        return {}
+
+    thumbnails = {}
+
+    for size in ICON_THUMBNAIL_SIZES:
+        thumbnail = image.copy()
+        thumbnail.thumbnail((size, size), Image.Resampling.LANCZOS)
+
+        thumbnail_buffer = io.BytesIO()
+        thumbnail.save(thumbnail_buffer, format="PNG", optimize=True)
+        thumbnails[size] = thumbnail_buffer.getvalue()
+
+    return thumbnails
@@ -0,0 +1,68 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+
+from app_distribution_server.config import (
+    DOWNLOAD_CONNECTION_BANDWIDTH_BYTES,
+    DOWNLOAD_GLOBAL_BANDWIDTH_BYTES,
+    DOWNLOAD_THROTTLE_MIN_SIZE_BYTES,
+)
+
+
+class BandwidthScheduler:
+    """
+    Paces streamed responses so that they share the global bandwidth equally,
+    each one also capped by the per connection bandwidth. A limit of 0 disables it.
+    Responses smaller than `min_throttled_size` bytes are never throttled.
+    """
+
+    def __init__(
+        self,
+        global_bandwidth: int = DOWNLOAD_GLOBAL_BANDWIDTH_BYTES,
+        connection_bandwidth: int = DOWNLOAD_CONNECTION_BANDWIDTH_BYTES,
+        min_throttled_size: int = DOWNLOAD_THROTTLE_MIN_SIZE_BYTES,
+    ):
+        self.global_bandwidth = global_bandwidth
+        self.connection_bandwidth = connection_bandwidth
+        self.min_throttled_size = min_throttled_size
+        self.active_streams = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.global_bandwidth or self.connection_bandwidth)
+
+    def should_throttle(self, size: int) -> bool:
+        return self.enabled and size >= self.min_throttled_size
+
+    def get_stream_bandwidth(self) -> float:
+        bandwidths = []
+
+        if self.global_bandwidth:
+            bandwidths.append(self.global_bandwidth / max(self.active_streams, 1))
+
+        if self.connection_bandwidth:
+            bandwidths.append(self.connection_bandwidth)
+
+        return min(bandwidths)
+
+    async def throttle(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        self.active_streams += 1
+        try:
+            next_chunk_at = time.monotonic()
+
+            async for chunk in chunks:
+                delay = next_chunk_at - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                yield chunk
+
+                # The share is re-evaluated on every chunk, as streams start and finish
+                next_chunk_at = max(next_chunk_at, time.monotonic()) + (
+                    len(chunk) / self.get_stream_bandwidth()
+                )
+        finally:
+            self.active_streams -= 1
+
+
+download_bandwidth_scheduler = BandwidthScheduler()
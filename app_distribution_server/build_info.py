@@ -13,8 +13,10 @@ from uuid import uuid4
 from androguard.core.apk import APK, get_apkid
 from pydantic import BaseModel, field_validator
 
+from app_distribution_server.app_icon import get_apk_icon, get_ipa_icon
 from app_distribution_server.errors import InvalidFileTypeError
 from app_distribution_server.logger import logger
+from app_distribution_server.tracing import traced
 
 
 class Platform(str, Enum):
@@ -62,6 +64,7 @@ class BuildInfo(LegacyAppInfo):
     file_size: int
     created_at: datetime | None
     platform: Platform
+    has_icon: bool = False
 
     @property
     def human_file_size(self) -> str:
@@ -84,7 +87,7 @@ class BuildInfo(LegacyAppInfo):
 def get_build_info_from_ipa(
     upload_id: str,
     ipa_file: BytesIO,
-) -> BuildInfo:
+) -> tuple[BuildInfo, bytes | None]:
     with zipfile.ZipFile(ipa_file, "r") as ipa:
         for file in ipa.namelist():
             if file.endswith(".app/Info.plist"):
@@ -99,7 +102,7 @@ def get_build_info_from_ipa(
                     logger.error("Failed to extract plist file information")
                     raise InvalidFileTypeError()
 
-                return BuildInfo(
+                build_info = BuildInfo(
                     upload_id=upload_id,
                     platform=Platform.ios,
                     app_title=app_title,
@@ -108,6 +111,9 @@ def get_build_info_from_ipa(
                     created_at=datetime.now(timezone.utc),
                     file_size=ipa_file.getbuffer().nbytes,
                 )
+                app_directory = file.removesuffix("Info.plist")
+
+                return build_info, get_ipa_icon(ipa, app_directory, info)
 
     logger.error("Could not find plist file in bundle")
     raise InvalidFileTypeError()
@@ -116,7 +122,7 @@ def get_build_info_from_ipa(
 def get_build_info_from_apk(
     upload_id: str,
     apk_file: BytesIO,
-) -> BuildInfo:
+) -> tuple[BuildInfo, bytes | None]:
     tempdir = tempfile.mkdtemp()
     file_name = "app.apk"
     file_path = os.path.join(tempdir, file_name)
@@ -129,7 +135,7 @@ def get_build_info_from_apk(
         apk = APK(file_path)
         app_title = apk.get_app_name()
 
-        return BuildInfo(
+        build_info = BuildInfo(
             upload_id=upload_id,
             platform=Platform.android,
             app_title=app_title,
@@ -138,14 +144,21 @@ def get_build_info_from_apk(
             created_at=datetime.now(timezone.utc),
             file_size=apk_file.getbuffer().nbytes,
         )
+
+        return build_info, get_apk_icon(apk)
     finally:
         shutil.rmtree(tempdir)
 
 
+@traced("build_info")
 def get_build_info(
     platform: Platform,
     app_file_content: bytes,
-):
+) -> tuple[BuildInfo, bytes | None]:
+    """
+    Returns the build info, along with the raw app icon (when one could be extracted).
+    """
+
     upload_id = str(uuid4())
 
     logger.debug(f"Obtaining build info from {upload_id!r}")
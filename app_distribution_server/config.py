@@ -2,6 +2,15 @@ import os
 
 from app_distribution_server.logger import logger
 
+
+def _get_bool_env(name: str, default: bool = False) -> bool:
+    raw_value = os.getenv(name)
+    if raw_value is None:
+        return default
+
+    return raw_value.lower() not in ["", "0", "false"]
+
+
 STORAGE_URL = os.getenv("STORAGE_URL", "osfs://./uploads")
 
 UPLOADS_SECRET_AUTH_TOKEN = os.getenv("UPLOADS_SECRET_AUTH_TOKEN")
@@ -20,6 +29,37 @@ APP_TITLE = os.getenv("APP_TITLE") or "iOS/Android app distribution server"
 _raw_logo_url = os.getenv("LOGO_URL", "/static/logo.svg")
 LOGO_URL: str | None = None if _raw_logo_url.lower() in ["", "0", "false"] else _raw_logo_url
 
+REQUEST_TRACING_ENABLED = _get_bool_env("REQUEST_TRACING_ENABLED")
+SLOW_REQUEST_THRESHOLD_MS = float(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "1000"))
+SLOW_REQUEST_LOG_SAMPLE_RATE = float(os.getenv("SLOW_REQUEST_LOG_SAMPLE_RATE", "1"))
+
+MAX_CONCURRENT_UPLOADS = int(os.getenv("MAX_CONCURRENT_UPLOADS", "0"))
+MAX_CONCURRENT_DOWNLOADS = int(os.getenv("MAX_CONCURRENT_DOWNLOADS", "0"))
+ADMISSION_MEMORY_BUDGET_BYTES = int(float(os.getenv("ADMISSION_MEMORY_BUDGET_MB", "0")) * 1024**2)
+ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "5"))
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "10"))
+
+_raw_batch_upload_max_parallelism = int(os.getenv("BATCH_UPLOAD_MAX_PARALLELISM", "4"))
+BATCH_UPLOAD_MAX_PARALLELISM: int | None = (
+    _raw_batch_upload_max_parallelism if _raw_batch_upload_max_parallelism > 0 else None
+)
+
+READINESS_PROBE_INTERVAL_SECONDS = float(os.getenv("READINESS_PROBE_INTERVAL_SECONDS", "5"))
+READINESS_PROBE_TIMEOUT_SECONDS = float(os.getenv("READINESS_PROBE_TIMEOUT_SECONDS", "5"))
+READINESS_STORAGE_LATENCY_THRESHOLD_MS = float(
+    os.getenv("READINESS_STORAGE_LATENCY_THRESHOLD_MS", "1000"),
+)
+
+DOWNLOAD_GLOBAL_BANDWIDTH_BYTES = int(
+    float(os.getenv("DOWNLOAD_GLOBAL_BANDWIDTH_MB_PER_SECOND", "0")) * 1024**2,
+)
+DOWNLOAD_CONNECTION_BANDWIDTH_BYTES = int(
+    float(os.getenv("DOWNLOAD_CONNECTION_BANDWIDTH_MB_PER_SECOND", "0")) * 1024**2,
+)
+DOWNLOAD_THROTTLE_MIN_SIZE_BYTES = int(
+    float(os.getenv("DOWNLOAD_THROTTLE_MIN_SIZE_MB", "1")) * 1024**2,
+)
+
 
 def get_absolute_url(path: str) -> str:
     if not path.startswith("/"):
@@ -1,14 +1,22 @@
 from fastapi import HTTPException, status
 
+from app_distribution_server.config import ADMISSION_RETRY_AFTER_SECONDS
+
 
 class UserError(HTTPException):
     STATUS_CODE: int
     ERROR_MESSAGE: str
+    RETRY_AFTER_SECONDS: int | None = None
 
     def __init__(self):
+        headers = None
+        if self.RETRY_AFTER_SECONDS is not None:
+            headers = {"Retry-After": str(self.RETRY_AFTER_SECONDS)}
+
         super().__init__(
             status_code=self.STATUS_CODE,
             detail=self.ERROR_MESSAGE,
+            headers=headers,
         )
 
 
@@ -32,6 +40,17 @@ class InternalServerError(UserError):
     STATUS_CODE = status.HTTP_500_INTERNAL_SERVER_ERROR
 
 
+class ServiceUnavailableError(UserError):
+    ERROR_MESSAGE = "Server is busy, please retry later"
+    STATUS_CODE = status.HTTP_503_SERVICE_UNAVAILABLE
+    RETRY_AFTER_SECONDS = ADMISSION_RETRY_AFTER_SECONDS
+
+
+class LengthRequiredError(UserError):
+    ERROR_MESSAGE = "Content-Length header is required"
+    STATUS_CODE = status.HTTP_411_LENGTH_REQUIRED
+
+
 default_exception_types: list[type[UserError]] = [
     InternalServerError,
     NotFoundError,
@@ -1,22 +1,36 @@
 import secrets
+from collections.abc import Callable, Coroutine
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any
 
-from fastapi import APIRouter, Depends, File, Path, UploadFile
+from anyio import from_thread
+from fastapi import APIRouter, Depends, File, Path, Request, Response, UploadFile
 from fastapi.responses import PlainTextResponse
+from fastapi.routing import APIRoute
 from fastapi.security import APIKeyHeader
+from pydantic import BaseModel
 
+from app_distribution_server.admission import Admission, upload_limiter
+from app_distribution_server.app_icon import get_icon_thumbnails
 from app_distribution_server.build_info import (
     BuildInfo,
     Platform,
     get_build_info,
 )
 from app_distribution_server.config import (
+    BATCH_UPLOAD_MAX_PARALLELISM,
     UPLOADS_SECRET_AUTH_TOKEN,
     get_absolute_url,
 )
 from app_distribution_server.errors import (
+    InternalServerError,
     InvalidFileTypeError,
+    LengthRequiredError,
     NotFoundError,
+    ServiceUnavailableError,
     UnauthorizedError,
+    UserError,
 )
 from app_distribution_server.logger import logger
 from app_distribution_server.storage import (
@@ -30,10 +44,17 @@ from app_distribution_server.storage import (
 x_auth_token_dependency = APIKeyHeader(name="X-Auth-Token")
 
 
+def is_valid_x_auth_token(x_auth_token: str | None) -> bool:
+    if x_auth_token is None:
+        return False
+
+    return secrets.compare_digest(x_auth_token, UPLOADS_SECRET_AUTH_TOKEN)
+
+
 def x_auth_token_validator(
     x_auth_token: str = Depends(x_auth_token_dependency),
 ):
-    if not secrets.compare_digest(x_auth_token, UPLOADS_SECRET_AUTH_TOKEN):
+    if not is_valid_x_auth_token(x_auth_token):
         raise UnauthorizedError()
 
 
@@ -43,37 +64,121 @@ router = APIRouter(
 )
 
 
-def _upload_app(
-    app_file: UploadFile,
-) -> BuildInfo:
-    platform: Platform
+def _get_declared_size(request: Request) -> int | None:
+    try:
+        return int(request.headers["Content-Length"])
+    except (KeyError, ValueError):
+        return None
+
+
+class UploadAdmissionRoute(APIRoute):
+    """
+    Admits uploads before FastAPI receives their body (to parse the form fields),
+    so requests over the limits are rejected without waiting for the whole file.
+    """
+
+    max_admission_slots: int | None = 1
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        route_handler = super().get_route_handler()
+
+        async def admitted_route_handler(request: Request) -> Response:
+            # Unauthorized requests don't take a slot, the route rejects them
+            if not is_valid_x_auth_token(request.headers.get("X-Auth-Token")):
+                return await route_handler(request)
+
+            declared_size = _get_declared_size(request)
+            if declared_size is None:
+                if upload_limiter.memory_budget:
+                    raise LengthRequiredError()
+                declared_size = 0
+
+            async with upload_limiter.admit(declared_size, self.max_admission_slots) as admission:
+                request.state.upload_admission = admission
+                return await route_handler(request)
+
+        return admitted_route_handler
+
+
+class BatchUploadAdmissionRoute(UploadAdmissionRoute):
+    """
+    Takes one upload slot per build processed at once, up to BATCH_UPLOAD_MAX_PARALLELISM.
+    """
+
+    max_admission_slots = BATCH_UPLOAD_MAX_PARALLELISM
+
+
+upload_router = APIRouter(route_class=UploadAdmissionRoute)
+batch_upload_router = APIRouter(route_class=BatchUploadAdmissionRoute)
+
+
+class BatchUploadResult(BaseModel):
+    file_name: str | None
+    build_info: BuildInfo | None = None
+    error: str | None = None
 
+
+def _get_upload_platform(
+    app_file: UploadFile,
+) -> Platform:
     if app_file.filename is None:
         raise InvalidFileTypeError()
 
     if app_file.filename.endswith(".ipa"):
-        platform = Platform.ios
+        return Platform.ios
 
-    elif app_file.filename.endswith(".apk"):
-        platform = Platform.android
+    if app_file.filename.endswith(".apk"):
+        return Platform.android
 
-    else:
-        raise InvalidFileTypeError()
+    raise InvalidFileTypeError()
+
+
+def _upload_app(
+    app_file: UploadFile,
+) -> BuildInfo:
+    platform = _get_upload_platform(app_file)
 
     app_file_content = app_file.file.read()
 
-    build_info = get_build_info(platform, app_file_content)
+    build_info, app_icon = get_build_info(platform, app_file_content)
     upload_id = build_info.upload_id
 
+    icon_thumbnails = get_icon_thumbnails(app_icon) if app_icon else {}
+    build_info.has_icon = bool(icon_thumbnails)
+
     logger.debug(f"Starting upload of {upload_id!r}")
 
-    save_upload(build_info, app_file_content)
+    save_upload(build_info, app_file_content, icon_thumbnails)
 
     logger.info(f"Successfully uploaded {build_info.bundle_id!r} ({upload_id!r})")
 
     return build_info
 
 
+def _upload_app_batch_item(
+    app_file: UploadFile,
+) -> BatchUploadResult:
+    try:
+        build_info = _upload_app(app_file)
+    except UserError as user_error:
+        logger.warning(f"Failed to upload {app_file.filename!r}: {user_error.ERROR_MESSAGE}")
+        return BatchUploadResult(
+            file_name=app_file.filename,
+            error=user_error.ERROR_MESSAGE,
+        )
+    except Exception:
+        logger.exception(f"Unexpected error uploading {app_file.filename!r}")
+        return BatchUploadResult(
+            file_name=app_file.filename,
+            error=InternalServerError.ERROR_MESSAGE,
+        )
+
+    return BatchUploadResult(
+        file_name=app_file.filename,
+        build_info=build_info,
+    )
+
+
 _upload_route_kwargs = {
     "responses": {
         InvalidFileTypeError.STATUS_CODE: {
@@ -82,13 +187,19 @@ _upload_route_kwargs = {
         UnauthorizedError.STATUS_CODE: {
             "description": UnauthorizedError.ERROR_MESSAGE,
         },
+        LengthRequiredError.STATUS_CODE: {
+            "description": LengthRequiredError.ERROR_MESSAGE,
+        },
+        ServiceUnavailableError.STATUS_CODE: {
+            "description": ServiceUnavailableError.ERROR_MESSAGE,
+        },
     },
     "summary": "Upload an iOS/Android app Build",
     "description": "On swagger UI authenticate in the upper right corner ('Authorize' button).",
 }
 
 
-@router.post("/upload", **_upload_route_kwargs)
+@upload_router.post("/upload", **_upload_route_kwargs)
 def _plaintext_post_upload(
     app_file: UploadFile = File(description="An `.ipa` or `.apk` build"),
 ) -> PlainTextResponse:
@@ -99,13 +210,48 @@ def _plaintext_post_upload(
     )
 
 
-@router.post("/api/upload", **_upload_route_kwargs)
+@upload_router.post("/api/upload", **_upload_route_kwargs)
 def _json_api_post_upload(
     app_file: UploadFile = File(description="An `.ipa` or `.apk` build"),
 ) -> BuildInfo:
     return _upload_app(app_file)
 
 
+_batch_upload_route_kwargs = {
+    **_upload_route_kwargs,
+    "summary": "Upload several iOS/Android app builds at once",
+    "description": (
+        "Builds are processed concurrently. Each file gets its own result, with either the build"
+        " info or the error that prevented its upload."
+        " On swagger UI authenticate in the upper right corner ('Authorize' button)."
+    ),
+}
+
+
+@batch_upload_router.post("/api/upload/batch", **_batch_upload_route_kwargs)
+def _json_api_post_upload_batch(
+    request: Request,
+    app_files: list[UploadFile] = File(description="Several `.ipa` or `.apk` builds"),
+) -> list[BatchUploadResult]:
+    # Admitted before the form was parsed, so the number of files was not known yet
+    admission: Admission = request.state.upload_admission
+    parallelism = max(len(app_files), 1)
+    from_thread.run(admission.shrink, parallelism)
+    if admission.slots is not None:
+        parallelism = min(admission.slots, parallelism)
+
+    with ThreadPoolExecutor(max_workers=parallelism) as executor:
+        futures = [
+            executor.submit(copy_context().run, _upload_app_batch_item, app_file)
+            for app_file in app_files
+        ]
+        return [future.result() for future in futures]
+
+
+router.include_router(upload_router)
+router.include_router(batch_upload_router)
+
+
 async def _api_delete_app_upload(
     upload_id: str = Path(),
 ) -> PlainTextResponse:
@@ -3,18 +3,28 @@ from typing import Literal
 from fastapi import APIRouter, Request, Response
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
+from starlette.concurrency import iterate_in_threadpool
 
+from app_distribution_server.admission import AdmittedResponse, download_limiter
+from app_distribution_server.app_icon import ICON_THUMBNAIL_SIZES
+from app_distribution_server.bandwidth import download_bandwidth_scheduler
 from app_distribution_server.build_info import (
     Platform,
 )
 from app_distribution_server.config import (
     get_absolute_url,
 )
+from app_distribution_server.errors import (
+    NotFoundError,
+)
 from app_distribution_server.storage import (
     get_upload_asserted_platform,
-    load_app_file,
+    iter_file_chunks,
     load_build_info,
+    load_icon_thumbnail,
+    open_app_file,
 )
+from app_distribution_server.tracing import trace_span
 
 router = APIRouter(tags=["App files"])
 
@@ -36,17 +46,18 @@ async def get_item_plist(
 
     build_info = load_build_info(upload_id)
 
-    return templates.TemplateResponse(
-        request=request,
-        name="plist.xml",
-        media_type="application/xml",
-        context={
-            "ipa_file_url": get_absolute_url(f"/get/{upload_id}/{Platform.ios.app_file_name}"),
-            "app_title": build_info.app_title,
-            "bundle_id": build_info.bundle_id,
-            "bundle_version": build_info.bundle_version,
-        },
-    )
+    with trace_span("render.template"):
+        return templates.TemplateResponse(
+            request=request,
+            name="plist.xml",
+            media_type="application/xml",
+            context={
+                "ipa_file_url": get_absolute_url(f"/get/{upload_id}/{Platform.ios.app_file_name}"),
+                "app_title": build_info.app_title,
+                "bundle_id": build_info.bundle_id,
+                "bundle_version": build_info.bundle_version,
+            },
+        )
 
 
 @router.get(
@@ -61,15 +72,52 @@ async def get_app_file(
     get_upload_asserted_platform(upload_id, expected_platform=expected_platform)
 
     build_info = load_build_info(upload_id)
-    app_file_content = load_app_file(build_info)
+    admission = await download_limiter.acquire(build_info.file_size)
+
+    # Opened before the response starts, so storage failures still get an error response
+    try:
+        app_file = open_app_file(build_info)
+    except Exception:
+        await admission.release()
+        raise
+
+    app_file_chunks = iterate_in_threadpool(iter_file_chunks(app_file))
+    if download_bandwidth_scheduler.should_throttle(build_info.file_size):
+        app_file_chunks = download_bandwidth_scheduler.throttle(app_file_chunks)
 
     created_at_prefix = (
         build_info.created_at.strftime("%Y-%m-%d_%H-%M-%S") if build_info.created_at else ""
     )
     file_name = f"{build_info.app_title} {build_info.bundle_version}{created_at_prefix}"
 
-    return Response(
-        content=app_file_content,
+    return AdmittedResponse(
+        content=app_file_chunks,
         media_type="application/octet-stream",
-        headers={"Content-Disposition": f"attachment; filename={file_name}.{file_type}"},
+        headers={
+            "Content-Disposition": f"attachment; filename={file_name}.{file_type}",
+            "Content-Length": str(build_info.file_size),
+        },
+        admission=admission,
+    )
+
+
+@router.get(
+    "/get/{upload_id}/icon/{size}.png",
+    response_class=Response,
+    summary="Get the app icon of an upload, in one of the pre-computed thumbnail sizes",
+)
+async def get_app_icon(
+    upload_id: str,
+    size: int,
+) -> Response:
+    if size not in ICON_THUMBNAIL_SIZES:
+        raise NotFoundError()
+
+    thumbnail = load_icon_thumbnail(upload_id, size)
+
+    return Response(
+        content=thumbnail,
+        media_type="image/png",
+        # Uploads are never modified, so their icons can be cached forever
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
     )
@@ -1,5 +1,7 @@
-from fastapi import APIRouter
-from fastapi.responses import PlainTextResponse
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app_distribution_server.storage_health import StorageHealth, storage_probe
 
 router = APIRouter(tags=["Healthz"])
 
@@ -10,3 +12,25 @@ router = APIRouter(tags=["Healthz"])
 )
 async def healthz() -> PlainTextResponse:
     return PlainTextResponse(content="OK")
+
+
+@router.get(
+    "/readyz",
+    response_model=StorageHealth,
+    responses={
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "model": StorageHealth,
+            "description": "Storage is unreachable or too slow",
+        },
+    },
+    summary="Readiness check, probing the storage backend",
+)
+async def readyz() -> JSONResponse:
+    storage_health = await storage_probe.get_health()
+
+    return JSONResponse(
+        status_code=(
+            status.HTTP_200_OK if storage_health.healthy else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
+        content=storage_health.model_dump(mode="json"),
+    )
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Request, Response
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 
+from app_distribution_server.app_icon import ICON_THUMBNAIL_SIZES
 from app_distribution_server.build_info import (
     Platform,
 )
@@ -18,6 +19,7 @@ from app_distribution_server.storage import (
     get_upload_asserted_platform,
     load_build_info,
 )
+from app_distribution_server.tracing import trace_span
 
 router = APIRouter(tags=["HTML page handling"])
 
@@ -43,17 +45,32 @@ async def render_get_item_installation_page(
 
     build_info = load_build_info(upload_id)
 
-    return templates.TemplateResponse(
-        request=request,
-        name="download-page.jinja.html",
-        context={
-            "page_title": f"{build_info.app_title} @{build_info.bundle_version} - {APP_TITLE}",
-            "build_info": build_info,
-            "install_url": install_url,
-            "qr_code_svg": get_qr_code_svg(install_url),
-            "logo_url": LOGO_URL,
-        },
-    )
+    icon_url = icon_srcset = None
+    if build_info.has_icon:
+        base_size = ICON_THUMBNAIL_SIZES[0]
+        icon_url = f"/get/{upload_id}/icon/{base_size}.png"
+        icon_srcset = ", ".join(
+            f"/get/{upload_id}/icon/{size}.png {size // base_size}x"
+            for size in ICON_THUMBNAIL_SIZES
+        )
+
+    with trace_span("render.qr_code"):
+        qr_code_svg = get_qr_code_svg(install_url)
+
+    with trace_span("render.template"):
+        return templates.TemplateResponse(
+            request=request,
+            name="download-page.jinja.html",
+            context={
+                "page_title": f"{build_info.app_title} @{build_info.bundle_version} - {APP_TITLE}",
+                "build_info": build_info,
+                "install_url": install_url,
+                "qr_code_svg": qr_code_svg,
+                "icon_url": icon_url,
+                "icon_srcset": icon_srcset,
+                "logo_url": LOGO_URL,
+            },
+        )
 
 
 async def render_error_page(
@@ -63,6 +80,7 @@ async def render_error_page(
     return templates.TemplateResponse(
         request=request,
         status_code=user_error.STATUS_CODE,
+        headers=user_error.headers,
         name="error.jinja.html",
         context={
             "page_title": user_error.ERROR_MESSAGE,
@@ -1,4 +1,7 @@
 import json
+from collections.abc import Iterator
+from typing import BinaryIO
+from uuid import uuid4
 
 from fs import errors, open_fs, path
 
@@ -6,27 +9,39 @@ from app_distribution_server.build_info import BuildInfo, LegacyAppInfo, Platfor
 from app_distribution_server.config import STORAGE_URL
 from app_distribution_server.errors import NotFoundError
 from app_distribution_server.logger import logger
+from app_distribution_server.tracing import traced
 
 PLIST_FILE_NAME = "info.plist"
 BUILD_INFO_JSON_FILE_NAME = "build_info.json"
 LEGACY_BUILD_INFO_JSON_FILE_NAME = "app_info.json"
 INDEXES_DIRECTORY = "_indexes"
+ICONS_DIRECTORY = "icons"
+HEALTH_CHECKS_DIRECTORY = path.join(INDEXES_DIRECTORY, "health_checks")
+APP_FILE_CHUNK_SIZE = 64 * 1024
 
 
 filesystem = open_fs(STORAGE_URL, create=True)
 
 
+@traced("storage")
 def create_parent_directories(upload_id: str):
     filesystem.makedirs(upload_id, recreate=True)
 
 
-def save_upload(build_info: BuildInfo, app_file_content: bytes):
+def save_upload(
+    build_info: BuildInfo,
+    app_file_content: bytes,
+    icon_thumbnails: dict[int, bytes] | None = None,
+):
     create_parent_directories(build_info.upload_id)
+    if icon_thumbnails:
+        save_icon_thumbnails(build_info.upload_id, icon_thumbnails)
     save_build_info(build_info)
     save_app_file(build_info, app_file_content)
     set_latest_build(build_info)
 
 
+@traced("storage")
 def get_upload_platform(upload_id: str) -> Platform | None:
     for platform in Platform:
         if filesystem.exists(path.join(upload_id, platform.app_file_name)):
@@ -53,6 +68,7 @@ def get_upload_asserted_platform(
     raise NotFoundError()
 
 
+@traced("storage")
 def save_build_info(build_info: BuildInfo):
     upload_id = build_info.upload_id
     filepath = f"{upload_id}/{BUILD_INFO_JSON_FILE_NAME}"
@@ -63,6 +79,7 @@ def save_build_info(build_info: BuildInfo):
         )
 
 
+@traced("storage")
 def load_build_info(upload_id: str) -> BuildInfo:
     try:
         filepath = path.join(upload_id, BUILD_INFO_JSON_FILE_NAME)
@@ -74,6 +91,7 @@ def load_build_info(upload_id: str) -> BuildInfo:
         return migrate_legacy_app_info(upload_id)
 
 
+@traced("storage")
 def migrate_legacy_app_info(upload_id: str) -> BuildInfo:
     logger.info(f"Migrating legacy upload {upload_id!r} to v2")
 
@@ -111,6 +129,7 @@ def get_app_file_path(
     )
 
 
+@traced("storage")
 def save_app_file(
     build_info: BuildInfo,
     app_file: bytes,
@@ -119,13 +138,45 @@ def save_app_file(
         writable_app_file.write(app_file)
 
 
-def load_app_file(
+@traced("storage")
+def open_app_file(
     build_info: BuildInfo,
-) -> bytes:
-    with filesystem.open(get_app_file_path(build_info), "rb") as app_file:
-        return app_file.read()
+) -> BinaryIO:
+    return filesystem.openbin(get_app_file_path(build_info), "r")
+
+
+def iter_file_chunks(
+    file: BinaryIO,
+    chunk_size: int = APP_FILE_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    with file:
+        while chunk := file.read(chunk_size):
+            yield chunk
+
+
+def get_icon_thumbnail_path(upload_id: str, size: int) -> str:
+    return path.join(upload_id, ICONS_DIRECTORY, f"{size}.png")
+
+
+@traced("storage")
+def save_icon_thumbnails(upload_id: str, icon_thumbnails: dict[int, bytes]):
+    filesystem.makedirs(path.join(upload_id, ICONS_DIRECTORY), recreate=True)
+
+    for size, thumbnail in icon_thumbnails.items():
+        with filesystem.open(get_icon_thumbnail_path(upload_id, size), "wb") as thumbnail_file:
+            thumbnail_file.write(thumbnail)
 
 
+@traced("storage")
+def load_icon_thumbnail(upload_id: str, size: int) -> bytes:
+    try:
+        with filesystem.open(get_icon_thumbnail_path(upload_id, size), "rb") as thumbnail_file:
+            return thumbnail_file.read()
+    except errors.ResourceNotFound as e:
+        raise NotFoundError() from e
+
+
+@traced("storage")
 def delete_upload(upload_id: str):
     try:
         filesystem.removetree(upload_id)
@@ -139,6 +190,7 @@ def get_latest_upload_by_bundle_id_filepath(bundle_id):
     return path.join(INDEXES_DIRECTORY, "latest_upload_by_bundle_id", f"{bundle_id}.txt")
 
 
+@traced("storage")
 def set_latest_build(build_info: BuildInfo):
     filepath = get_latest_upload_by_bundle_id_filepath(build_info.bundle_id)
     filesystem.makedirs(path.dirname(filepath), recreate=True)
@@ -147,6 +199,7 @@ def set_latest_build(build_info: BuildInfo):
         file.write(build_info.upload_id)
 
 
+@traced("storage")
 def get_latest_upload_id_by_bundle_id(bundle_id: str) -> str | None:
     filepath = get_latest_upload_by_bundle_id_filepath(bundle_id)
 
@@ -157,3 +210,25 @@ def get_latest_upload_id_by_bundle_id(bundle_id: str) -> str | None:
 
     with filesystem.open(filepath, "r") as file:
         return file.readline().strip()
+
+
+@traced("storage")
+def probe_storage():
+    """
+    Writes, reads back and deletes a small file, raising if the storage misbehaves.
+    """
+
+    probe_content = uuid4().hex
+    filepath = path.join(HEALTH_CHECKS_DIRECTORY, f"{probe_content}.txt")
+    filesystem.makedirs(HEALTH_CHECKS_DIRECTORY, recreate=True)
+
+    try:
+        with filesystem.open(filepath, "w") as file:
+            file.write(probe_content)
+
+        with filesystem.open(filepath, "r") as file:
+            if file.read() != probe_content:
+                raise RuntimeError(f"Storage probe file {filepath!r} has unexpected content")
+    finally:
+        if filesystem.exists(filepath):
+            filesystem.remove(filepath)
@@ -0,0 +1,124 @@
+import asyncio
+import math
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+from app_distribution_server.config import (
+    READINESS_PROBE_INTERVAL_SECONDS,
+    READINESS_PROBE_TIMEOUT_SECONDS,
+    READINESS_STORAGE_LATENCY_THRESHOLD_MS,
+)
+from app_distribution_server.logger import logger
+from app_distribution_server.storage import probe_storage
+
+LATENCY_WINDOW_SIZE = 20
+
+
+class StorageHealth(BaseModel):
+    healthy: bool
+    error: str | None
+    probed_at: datetime
+    last_latency_ms: float | None
+    latency_p50_ms: float | None
+    latency_p90_ms: float | None
+    latency_p99_ms: float | None
+
+
+def get_percentile(sorted_values: list[float], percentile: int) -> float | None:
+    if not sorted_values:
+        return None
+
+    rank = math.ceil(percentile / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def _timed_probe_storage() -> float:
+    started_at = time.perf_counter()
+    probe_storage()
+    return (time.perf_counter() - started_at) * 1000
+
+
+class StorageProbe:
+    """
+    Probes the storage at most once every `interval` seconds, sharing the result between checks.
+    Storage is unhealthy when the last probe failed, or when the median latency of the
+    recent probes is over `latency_threshold_ms`.
+    """
+
+    def __init__(
+        self,
+        interval: float = READINESS_PROBE_INTERVAL_SECONDS,
+        timeout: float = READINESS_PROBE_TIMEOUT_SECONDS,
+        latency_threshold_ms: float = READINESS_STORAGE_LATENCY_THRESHOLD_MS,
+    ):
+        self.interval = interval
+        self.timeout = timeout
+        self.latency_threshold_ms = latency_threshold_ms
+        self.latencies_ms: deque[float] = deque(maxlen=LATENCY_WINDOW_SIZE)
+        self.last_health: StorageHealth | None = None
+        self._lock = asyncio.Lock()
+        self._probe_task: asyncio.Future[float] | None = None
+
+    def _is_fresh(self) -> bool:
+        if self.last_health is None:
+            return False
+
+        age = datetime.now(timezone.utc) - self.last_health.probed_at
+        return age.total_seconds() < self.interval
+
+    async def get_health(self) -> StorageHealth:
+        async with self._lock:
+            if not self._is_fresh():
+                self.last_health = await self._probe()
+
+            assert self.last_health is not None
+            return self.last_health
+
+    async def _probe(self) -> StorageHealth:
+        # A probe stuck on an unresponsive storage keeps running in its thread,
+        # following checks wait on it rather than piling up new ones.
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_task = asyncio.ensure_future(run_in_threadpool(_timed_probe_storage))
+
+        last_latency_ms: float | None = None
+        error: str | None = None
+
+        try:
+            last_latency_ms = await asyncio.wait_for(
+                asyncio.shield(self._probe_task),
+                timeout=self.timeout,
+            )
+        except TimeoutError:
+            last_latency_ms = self.timeout * 1000
+            error = f"Storage probe timed out after {self.timeout}s"
+        except Exception as e:
+            error = f"Storage probe failed: {e}"
+
+        if last_latency_ms is not None:
+            self.latencies_ms.append(last_latency_ms)
+
+        sorted_latencies = sorted(self.latencies_ms)
+        latency_p50_ms = get_percentile(sorted_latencies, 50)
+
+        if error is None and latency_p50_ms and latency_p50_ms > self.latency_threshold_ms:
+            error = f"Storage median latency is {latency_p50_ms:.1f}ms"
+
+        if error:
+            logger.warning(f"Storage is unhealthy: {error}")
+
+        return StorageHealth(
+            healthy=error is None,
+            error=error,
+            probed_at=datetime.now(timezone.utc),
+            last_latency_ms=last_latency_ms,
+            latency_p50_ms=latency_p50_ms,
+            latency_p90_ms=get_percentile(sorted_latencies, 90),
+            latency_p99_ms=get_percentile(sorted_latencies, 99),
+        )
+
+
+storage_probe = StorageProbe()
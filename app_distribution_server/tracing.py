@@ -0,0 +1,126 @@
+import functools
+import random
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import ParamSpec, TypeVar
+
+from app_distribution_server.config import (
+    SLOW_REQUEST_LOG_SAMPLE_RATE,
+    SLOW_REQUEST_THRESHOLD_MS,
+)
+from app_distribution_server.logger import logger
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+@dataclass
+class SpanTiming:
+    count: int = 0
+    duration_ms: float = 0.0
+
+
+@dataclass
+class RequestTrace:
+    """
+    Durations and call counts of the traced operations of a single request.
+    Nested spans are recorded independently, so their durations may overlap.
+    """
+
+    started_at: float = field(default_factory=time.perf_counter)
+    spans: dict[str, SpanTiming] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def record(self, name: str, duration_ms: float):
+        with self._lock:
+            span_timing = self.spans.setdefault(name, SpanTiming())
+            span_timing.count += 1
+            span_timing.duration_ms += duration_ms
+
+    def get_server_timing_header(self) -> str:
+        metrics = [
+            f'{name};dur={timing.duration_ms:.1f};desc="{timing.count}x"'
+            for name, timing in self.spans.items()
+        ]
+        metrics.append(f"total;dur={self.total_ms:.1f}")
+        return ", ".join(metrics)
+
+    def get_breakdown(self) -> str:
+        return " ".join(
+            f"{name}={timing.duration_ms:.1f}ms/{timing.count}x"
+            for name, timing in self.spans.items()
+        )
+
+
+_current_request_trace: ContextVar[RequestTrace | None] = ContextVar(
+    "current_request_trace",
+    default=None,
+)
+
+
+@contextmanager
+def start_request_trace() -> Iterator[RequestTrace]:
+    request_trace = RequestTrace()
+    token = _current_request_trace.set(request_trace)
+    try:
+        yield request_trace
+    finally:
+        _current_request_trace.reset(token)
+
+
+@contextmanager
+def trace_span(name: str) -> Iterator[None]:
+    request_trace = _current_request_trace.get()
+    if request_trace is None:
+        yield
+        return
+
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        request_trace.record(name, (time.perf_counter() - started_at) * 1000)
+
+
+def traced(prefix: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        span_name = f"{prefix}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if _current_request_trace.get() is None:
+                return func(*args, **kwargs)
+
+            with trace_span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def log_request_trace(
+    method: str,
+    path: str,
+    status_code: int,
+    request_trace: RequestTrace,
+):
+    total_ms = request_trace.total_ms
+    message = (
+        f"{method} {path} {status_code} took {total_ms:.1f}ms"
+        f" ({request_trace.get_breakdown() or 'no traced operations'})"
+    )
+
+    is_slow = total_ms >= SLOW_REQUEST_THRESHOLD_MS
+    if is_slow and random.random() < SLOW_REQUEST_LOG_SAMPLE_RATE:  # noqa: S311
+        logger.warning(f"Slow request: {message}")
+    else:
+        logger.debug(f"Request trace: {message}")